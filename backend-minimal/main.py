@@ -9,8 +9,10 @@ from datetime import datetime
 import uuid
 import json
 import time
+from collections import deque
 from api.apps import routers as app_routers
-from services.role_classifier import RoleClassifier
+from services.role_classifier import RoleClassifier, VALID_ROLES
+from services.history_utils import new_cid, utc_timestamp
 
 CHUNK_SIZE = 4096
 
@@ -49,8 +51,8 @@ class ConnectionManager:
         self.audio_chunk_threshold = 0.1  # 100ms threshold for audio chunks
         self.save_debug_audio = save_debug_audio  # <--- New config option
         # --- Chat history ---
-        self.chat_history = []  # List of dicts: {role, text, contentName}
         self.max_history = 50   # Increased rolling window size to capture more conversation
+        self.chat_history = deque(maxlen=self.max_history)  # Rolling window of dicts: {role, text, contentName}
         # --- Message deduplication ---
         self.processed_messages = set()  # Track processed message hashes to prevent duplicates
         # --- Role classification ---
@@ -69,12 +71,12 @@ class ConnectionManager:
             source_info: Optional dict with source information for debugging
         """
         # Validate and correct role if needed
-        if not self.role_classifier.validate_role(role):
+        if role not in VALID_ROLES:
             logger.warning(f"Invalid role '{role}' provided to add_history. Correcting to valid role.")
             role = self.role_classifier.correct_invalid_role(role)
         
-        content_name = str(uuid.uuid4())
-        timestamp = datetime.utcnow().isoformat() + 'Z'
+        content_name = new_cid()
+        timestamp = utc_timestamp()
         
         message = {
             'role': role,
@@ -87,20 +89,28 @@ class ConnectionManager:
         if source_info:
             message['source_info'] = source_info
         
-        self.chat_history.append(message)
+        # The bounded deque drops the oldest message once the window is full
+        if len(self.chat_history) == self.max_history:
+            logger.info(f"🗑️ Removed 1 old message from history (keeping last {self.max_history})")
         
-        # Keep only the last N messages
-        if len(self.chat_history) > self.max_history:
-            removed_messages = len(self.chat_history) - self.max_history
-            self.chat_history = self.chat_history[-self.max_history:]
-            logger.info(f"🗑️ Removed {removed_messages} old messages from history (keeping last {self.max_history})")
+        self.chat_history.append(message)
         
         logger.info(f"💬 Added to history: {role} - '{text[:100]}...' (Total: {len(self.chat_history)} messages)")
         logger.debug(f"Added message to history: role={role}, text_length={len(text)}, source={source_info}")
 
     def get_history(self):
-        """Get the current rolling chat history."""
-        return self.chat_history.copy()
+        """
+        Get the current rolling chat history.
+        
+        Returns the live history without copying; callers must treat it as
+        read-only and must not await while iterating it. Use
+        get_history_snapshot() when a mutable copy is needed.
+        """
+        return self.chat_history
+
+    def get_history_snapshot(self):
+        """Get a mutable copy of the current rolling chat history."""
+        return list(self.chat_history)
     
     def add_message_from_event(self, event_data, text, event_type=None, source="websocket"):
         """
@@ -112,8 +122,10 @@ class ConnectionManager:
             event_type: Optional explicit event type
             source: The source of the message (default: "websocket")
         """
-        # Classify the role based on event data
-        if event_type:
+        # Classify the role based on event data; known event types map straight to a role
+        if event_type in self.role_classifier.EVENT_ROLES:
+            role = self.role_classifier.EVENT_ROLES[event_type]
+        elif event_type:
             role = self.role_classifier.classify_message_role(
                 source=source,
                 event_type=event_type,
@@ -273,7 +285,7 @@ class ConnectionManager:
         logger.info("Nova Sonic session started")
 
         # --- Send conversation history after system prompt ---
-        history = self.get_history()
+        history = self.get_history_snapshot()
         # Only include history starting with a USER message
         while history and history[0]['role'] != 'USER':
             history.pop(0)
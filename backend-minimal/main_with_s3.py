@@ -152,7 +152,8 @@ async def health_check():
     """Health check endpoint with S3 connectivity status."""
     s3_status = "disabled"
     if s3_service.enabled:
-        connectivity = s3_service._validate_s3_connectivity()
+        # head_bucket blocks (with client retries), so keep it off the event loop
+        connectivity = await asyncio.to_thread(s3_service._validate_s3_connectivity)
         s3_status = "connected" if connectivity else "error"
     
     return {
@@ -0,0 +1,36 @@
+"""
+History Helpers
+
+This module provides the content id and timestamp helpers used when
+messages are added to the conversation history.
+"""
+
+import os
+import time
+
+
+def new_cid() -> str:
+    """Return a random 128-bit hex content id; cheaper than str(uuid.uuid4())."""
+    return os.urandom(16).hex()
+
+
+# Last generated history timestamp, reused for calls within the same millisecond
+_last_ts_ns = 0
+_last_ts = ''
+
+
+def utc_timestamp() -> str:
+    """
+    Return the current UTC time as an ISO-8601 string with a 'Z' suffix.
+    
+    The formatted string is reused for calls less than 1 ms apart. It is
+    regenerated whenever the clock moves backwards (e.g. an NTP step), so a
+    stale future timestamp is never returned.
+    """
+    global _last_ts_ns, _last_ts
+    now_ns = time.time_ns()
+    if not 0 <= now_ns - _last_ts_ns < 1_000_000:
+        sec, ns = divmod(now_ns, 1_000_000_000)
+        _last_ts = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec)) + f'.{ns // 1000:06d}Z'
+        _last_ts_ns = now_ns
+    return _last_ts
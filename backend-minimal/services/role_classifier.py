@@ -19,6 +19,10 @@ class MessageRole(Enum):
     ASSISTANT = "ASSISTANT"
 
 
+# Valid role strings for O(1) membership checks on hot paths
+VALID_ROLES = frozenset(role.value for role in MessageRole)
+
+
 class RoleClassifier:
     """
     Service for classifying message roles based on source and event type.
@@ -47,6 +51,9 @@ class RoleClassifier:
         "contentEnd": MessageRole.ASSISTANT,
     }
     
+    # Event type -> role string lookup, precomputed from the rules above
+    EVENT_ROLES = {event_type: role.value for event_type, role in ROLE_CLASSIFICATION_RULES.items()}
+    
     # Default role for ambiguous cases
     DEFAULT_ROLE = MessageRole.ASSISTANT
     
@@ -72,11 +79,11 @@ class RoleClassifier:
             str: The role ("USER" or "ASSISTANT")
         """
         try:
-            # First, try to classify based on event type
-            if event_type and event_type in self.ROLE_CLASSIFICATION_RULES:
-                role = self.ROLE_CLASSIFICATION_RULES[event_type]
-                logger.debug(f"Classified message as {role.value} based on event_type: {event_type}")
-                return role.value
+            # First, try to classify based on event type with a single table lookup
+            role = self.EVENT_ROLES.get(event_type)
+            if role is not None:
+                logger.debug(f"Classified message as {role} based on event_type: {event_type}")
+                return role
             
             # Try to infer event type from content structure
             if content:
@@ -169,13 +176,12 @@ class RoleClassifier:
             logger.warning(f"Role validation failed: role is not a string: {type(role)}")
             return False
         
-        try:
-            MessageRole(role)
+        if role in VALID_ROLES:
             return True
-        except ValueError:
-            logger.warning(f"Role validation failed: invalid role '{role}'. "
-                         f"Valid roles are: {[r.value for r in MessageRole]}")
-            return False
+        
+        logger.warning(f"Role validation failed: invalid role '{role}'. "
+                     f"Valid roles are: {[r.value for r in MessageRole]}")
+        return False
     
     def get_valid_roles(self) -> list[str]:
         """
@@ -217,12 +223,16 @@ class RoleClassifier:
             if "event" in event_data and isinstance(event_data["event"], dict):
                 event = event_data["event"]
                 
-                # Check for specific event types
-                for event_type in self.ROLE_CLASSIFICATION_RULES.keys():
-                    if event_type in event:
-                        role = self.ROLE_CLASSIFICATION_RULES[event_type]
-                        logger.debug(f"Classified WebSocket event as {role.value} based on event type: {event_type}")
-                        return role.value
+                # Check for specific event types. Events usually carry a single
+                # key, so look it up directly; with several keys, scan in rule
+                # order so user events keep precedence over assistant events
+                event_roles = self.EVENT_ROLES
+                event_types = event if len(event) == 1 else event_roles
+                for event_type in event_types:
+                    role = event_roles.get(event_type)
+                    if role is not None and event_type in event:
+                        logger.debug(f"Classified WebSocket event as {role} based on event type: {event_type}")
+                        return role
             
             # Fallback to general classification
             return self.classify_message_role(
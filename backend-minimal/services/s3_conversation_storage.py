@@ -7,17 +7,25 @@ S3 key generation, and upload operations with comprehensive error handling.
 """
 
 import os
-import json
+import io
+import re
+import gzip
+import hashlib
+import asyncio
 import logging
+import threading
 import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 from dotenv import load_dotenv
 try:
-    from .role_classifier import RoleClassifier
+    from .role_classifier import RoleClassifier, VALID_ROLES
 except ImportError:
-    from role_classifier import RoleClassifier
+    from role_classifier import RoleClassifier, VALID_ROLES
 
 # Load environment variables from .env file in backend directory
 import pathlib
@@ -26,6 +34,26 @@ load_dotenv(backend_dir / '.env')
 
 logger = logging.getLogger(__name__)
 
+# Payloads at or above this size are uploaded with multipart transfers
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+# Upper bound on concurrent PUTs issued by upload_conversations_batch
+MAX_CONCURRENT_UPLOADS = 16
+
+# Matches the tool name in texts like "User requested tool: room_service"
+_TOOL_RE = re.compile(r'tool:\s*(\S+)', re.IGNORECASE)
+
+# Event types whose messages may name a tool
+_TOOL_EVENTS = frozenset(('toolUse', 'toolResult'))
+
+# Top-level fields every conversation payload must contain
+_REQUIRED_FIELDS = ('session_id', 'metadata', 'conversation')
+
+# S3 client shared by all S3StorageService instances; building one resolves
+# credentials and sets up TLS, so it is done once per process
+_SHARED_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
 
 class S3StorageService:
     """
@@ -54,6 +82,12 @@ class S3StorageService:
         
         # S3 client initialization
         self.s3_client = None
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_THRESHOLD,
+            max_concurrency=8,
+            use_threads=True
+        )
         self._initialize_s3_client()
         
         # Role classifier for validation and correction
@@ -68,30 +102,43 @@ class S3StorageService:
         """
         Initialize S3 client using .env credentials.
         Loads AWS credentials from environment variables set by .env file.
+        The client is created once and reused by every service instance.
         """
+        global _SHARED_CLIENT
+        
         if not self.enabled:
             return
             
         try:
-            # Get AWS credentials from environment variables (loaded from .env)
-            aws_access_key_id = os.getenv('aws_access_key_id')
-            aws_secret_access_key = os.getenv('aws_secret_access_key')
-            aws_session_token = os.getenv('aws_session_token')
-            
-            if not aws_access_key_id or not aws_secret_access_key:
-                logger.error("AWS credentials not found in environment variables")
-                self.enabled = False
-                return
-            
-            # Create S3 client with explicit credentials
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                aws_session_token=aws_session_token,
-                region_name='us-east-1'  # Default region
-            )
-            logger.info("S3 client initialized successfully with .env credentials")
+            with _CLIENT_LOCK:
+                if _SHARED_CLIENT is None:
+                    # Get AWS credentials from environment variables (loaded from .env)
+                    aws_access_key_id = os.getenv('aws_access_key_id')
+                    aws_secret_access_key = os.getenv('aws_secret_access_key')
+                    aws_session_token = os.getenv('aws_session_token')
+                    
+                    if not aws_access_key_id or not aws_secret_access_key:
+                        logger.error("AWS credentials not found in environment variables")
+                        self.enabled = False
+                        return
+                    
+                    # Create S3 client with explicit credentials and a connection
+                    # pool large enough for batched uploads
+                    _SHARED_CLIENT = boto3.client(
+                        's3',
+                        aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key,
+                        aws_session_token=aws_session_token,
+                        region_name='us-east-1',  # Default region
+                        config=Config(
+                            max_pool_connections=50,
+                            retries={'max_attempts': 5, 'mode': 'adaptive'},
+                            tcp_keepalive=True
+                        )
+                    )
+                    logger.info("S3 client initialized successfully with .env credentials")
+                
+                self.s3_client = _SHARED_CLIENT
         except Exception as e:
             logger.error(f"Failed to initialize S3 client: {e}")
             self.enabled = False
@@ -131,7 +178,10 @@ class S3StorageService:
         """
         Generate hierarchical S3 key for conversation storage.
         
-        Pattern: askimo-audio-output/conversations/{YYYY}/{MM}/{DD}/conversation_{YYYYMMDD}_{HHMMSS}_{session_id}.json
+        Pattern: askimo-audio-output/conversations/{shard}/{YYYY}/{MM}/{DD}/conversation_{YYYYMMDD}_{HHMMSS}_{session_id}.json.gz
+        
+        The shard is the first two hex characters of sha1(session_id), which
+        spreads writes across S3 key prefixes.
         
         Args:
             session_id: Unique session identifier
@@ -143,138 +193,160 @@ class S3StorageService:
         # Use UTC timezone for consistent key generation
         utc_timestamp = timestamp.replace(tzinfo=timezone.utc) if timestamp.tzinfo is None else timestamp.astimezone(timezone.utc)
         
-        # Extract date components
-        year = utc_timestamp.strftime('%Y')
-        month = utc_timestamp.strftime('%m')
-        day = utc_timestamp.strftime('%d')
-        date_str = utc_timestamp.strftime('%Y%m%d')
-        time_str = utc_timestamp.strftime('%H%M%S')
+        # Extract date components from integer attributes rather than strftime
+        y, mo, d = utc_timestamp.year, utc_timestamp.month, utc_timestamp.day
+        H, M, S = utc_timestamp.hour, utc_timestamp.minute, utc_timestamp.second
+        
+        # Shard by session id to spread load across S3 partitions (not a security use)
+        shard = hashlib.sha1(session_id.encode('utf-8'), usedforsecurity=False).hexdigest()[:2]
         
         # Generate hierarchical key with the specified prefix
-        key = f"{self.s3_prefix}/{year}/{month}/{day}/conversation_{date_str}_{time_str}_{session_id}.json"
+        key = f"{self.s3_prefix}/{shard}/{y:04d}/{mo:02d}/{d:02d}/conversation_{y:04d}{mo:02d}{d:02d}_{H:02d}{M:02d}{S:02d}_{session_id}.json.gz"
         return key
     
-    def _validate_and_correct_roles(self, chat_history: List[Dict]) -> List[Dict]:
+    def _validate_and_correct_roles(self, chat_history: List[Dict]) -> Tuple[List[Dict], int]:
         """
         Validate and correct role assignments in chat history.
         
+        Messages with a valid role are returned as-is; only corrected
+        messages are copied, so the input messages are never mutated.
+        
         Args:
             chat_history: List of conversation messages
             
         Returns:
-            List[Dict]: Chat history with validated and corrected roles
+            Tuple[List[Dict], int]: Chat history with validated and corrected roles,
+            and the number of corrections made
         """
         corrected_history = []
         corrections_made = 0
         
         for msg in chat_history:
-            corrected_msg = msg.copy()
             original_role = msg.get('role', 'UNKNOWN')
             
             # Validate and correct role
-            if not self.role_classifier.validate_role(original_role):
+            if not isinstance(original_role, str) or original_role not in VALID_ROLES:
                 corrected_role = self.role_classifier.correct_invalid_role(original_role)
-                corrected_msg['role'] = corrected_role
+                msg = {**msg, 'role': corrected_role}
                 corrections_made += 1
                 logger.warning(f"Corrected invalid role '{original_role}' to '{corrected_role}' for message: {msg.get('text', '')[:50]}...")
             
-            corrected_history.append(corrected_msg)
+            corrected_history.append(msg)
         
         if corrections_made > 0:
             logger.info(f"Made {corrections_made} role corrections in conversation history")
         
-        return corrected_history
+        return corrected_history, corrections_made
     
-    def _extract_tools_used(self, chat_history: List[Dict]) -> List[str]:
-        """
-        Extract list of tools used from conversation history.
-        
-        Args:
-            chat_history: List of conversation messages
-            
-        Returns:
-            List[str]: List of tool names used in the conversation
-        """
-        tools_used = set()
-        
-        for msg in chat_history:
-            # Check source info for tool usage
-            source_info = msg.get('source_info', {})
-            if source_info.get('event_type') in ['toolUse', 'toolResult']:
-                # Try to extract tool name from message text
-                text = msg.get('text', '')
-                if 'tool:' in text.lower():
-                    # Extract tool name from text like "User requested tool: room_service"
-                    parts = text.split('tool:')
-                    if len(parts) > 1:
-                        tool_name = parts[1].strip().split()[0]
-                        tools_used.add(tool_name)
-        
-        return list(tools_used)
-    
-    def _format_conversation_data(self, session_id: str, chat_history: List[Dict], metadata: Dict) -> Dict:
+    def _format_conversation_data(self, session_id: str, chat_history: List[Dict], metadata: Dict) -> Tuple[Dict, Dict[str, int]]:
         """
         Format conversation data for S3 storage with role validation and correction.
         
+        Role validation, role statistics, tool extraction and message formatting
+        are done in a single pass over the chat history. Because every role is
+        corrected on the way through, the result is valid by construction and
+        does not need a second validate_conversation_data pass.
+        
         Args:
             session_id: Unique session identifier
             chat_history: List of conversation messages
             metadata: Additional conversation metadata
             
         Returns:
-            Dict: Formatted conversation data ready for JSON serialization
+            Tuple[Dict, Dict[str, int]]: Formatted conversation data ready for JSON
+            serialization, and the statistics gathered while formatting
         """
-        # Validate and correct roles in chat history
-        validated_history = self._validate_and_correct_roles(chat_history)
-        
-        # Calculate accurate conversation statistics based on corrected roles
-        user_messages = sum(1 for msg in validated_history if msg.get('role') == 'USER')
-        assistant_messages = sum(1 for msg in validated_history if msg.get('role') == 'ASSISTANT')
+        # Bind hot lookups to locals once instead of per message
+        correct_invalid_role = self.role_classifier.correct_invalid_role
         
-        # Extract tools used from conversation
-        tools_used = self._extract_tools_used(validated_history)
+        # Fallback timestamp, computed once rather than per message
+        default_ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
         
-        # Format messages with validation
         conversation_messages = []
-        for msg in validated_history:
+        append_message = conversation_messages.append
+        user_messages = 0
+        assistant_messages = 0
+        corrections_made = 0
+        tools_used = set()
+        
+        for msg in chat_history:
+            # Validate and correct role (type check first: non-string roles may be unhashable)
+            role = msg.get('role', 'UNKNOWN')
+            if not isinstance(role, str) or role not in VALID_ROLES:
+                corrected_role = correct_invalid_role(role)
+                corrections_made += 1
+                logger.warning(f"Corrected invalid role '{role}' to '{corrected_role}' for message: {msg.get('text', '')[:50]}...")
+                role = corrected_role
+            
+            # Calculate conversation statistics based on corrected roles
+            if role == 'USER':
+                user_messages += 1
+            elif role == 'ASSISTANT':
+                assistant_messages += 1
+            
             formatted_msg = {
-                'role': msg.get('role', 'ASSISTANT'),  # Default to ASSISTANT if somehow still missing
+                'role': role,
                 'text': msg.get('text', ''),
                 'contentName': msg.get('contentName', ''),
-                'timestamp': msg.get('timestamp', datetime.utcnow().isoformat() + 'Z')
+                'timestamp': msg.get('timestamp', default_ts)
             }
             
             # Include source info for debugging if present
             if 'source_info' in msg:
-                formatted_msg['source_info'] = msg['source_info']
+                source_info = msg['source_info']
+                formatted_msg['source_info'] = source_info
+                
+                # Extract tool name from text like "User requested tool: room_service"
+                if source_info and source_info.get('event_type') in _TOOL_EVENTS:
+                    match = _TOOL_RE.search(formatted_msg['text'])
+                    if match:
+                        tools_used.add(match.group(1))
             
-            conversation_messages.append(formatted_msg)
+            append_message(formatted_msg)
+        
+        if corrections_made > 0:
+            logger.info(f"Made {corrections_made} role corrections in conversation history")
+        
+        tools_used = list(tools_used)
+        message_count = len(conversation_messages)
         
         # Build complete conversation data structure with accurate statistics
         conversation_data = {
             'session_id': session_id,
             'metadata': {
-                'start_time': metadata.get('start_time', datetime.utcnow().isoformat() + 'Z'),
-                'end_time': metadata.get('end_time', datetime.utcnow().isoformat() + 'Z'),
+                'start_time': metadata.get('start_time', default_ts),
+                'end_time': metadata.get('end_time', default_ts),
                 'duration_seconds': metadata.get('duration_seconds', 0),
-                'message_count': len(validated_history),
+                'message_count': message_count,
                 'user_messages': user_messages,
                 'assistant_messages': assistant_messages,
                 'tools_used': tools_used,
-                'role_corrections_made': len(chat_history) - len([msg for msg in chat_history if self.role_classifier.validate_role(msg.get('role', ''))])
+                'role_corrections_made': corrections_made
             },
             'conversation': conversation_messages
         }
         
         # Log statistics for verification
-        logger.info(f"Conversation statistics - Total: {len(validated_history)}, User: {user_messages}, Assistant: {assistant_messages}, Tools: {len(tools_used)}")
+        logger.info(f"Conversation statistics - Total: {message_count}, User: {user_messages}, Assistant: {assistant_messages}, Tools: {len(tools_used)}")
+        
+        statistics = {
+            'total_messages': message_count,
+            'user_messages': user_messages,
+            'assistant_messages': assistant_messages,
+            'invalid_roles': 0,
+            'corrections_made': corrections_made,
+            'tools_used': len(tools_used)
+        }
         
-        return conversation_data
+        return conversation_data, statistics
     
     def validate_conversation_data(self, conversation_data: Dict) -> Dict[str, Any]:
         """
         Validate conversation data integrity and return validation results.
         
+        Intended for externally supplied payloads; data built by
+        _format_conversation_data is already valid.
+        
         Args:
             conversation_data: Formatted conversation data
             
@@ -290,8 +362,7 @@ class S3StorageService:
         
         try:
             # Validate required fields
-            required_fields = ['session_id', 'metadata', 'conversation']
-            for field in required_fields:
+            for field in _REQUIRED_FIELDS:
                 if field not in conversation_data:
                     validation_results['issues'].append(f"Missing required field: {field}")
                     validation_results['is_valid'] = False
@@ -308,7 +379,7 @@ class S3StorageService:
                     continue
                 
                 role = msg['role']
-                if self.role_classifier.validate_role(role):
+                if isinstance(role, str) and role in VALID_ROLES:
                     role_counts[role] += 1
                 else:
                     role_counts['INVALID'] += 1
@@ -362,9 +433,111 @@ class S3StorageService:
         
         return validation_results
     
+    def _parse_end_time(self, metadata: Dict) -> datetime:
+        """
+        Parse the conversation end time used to build the S3 key.
+        
+        Args:
+            metadata: Additional conversation metadata
+            
+        Returns:
+            datetime: Parsed end_time, or the current UTC time if it is not set
+            
+        Raises:
+            ValueError: If end_time is not an ISO-8601 timestamp string
+        """
+        end_time = metadata.get('end_time', datetime.utcnow().isoformat())
+        if not isinstance(end_time, str):
+            raise ValueError(f"end_time must be an ISO-8601 string, got {type(end_time).__name__}")
+        return datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+    
+    def _prepare_upload(self, session_id: str, chat_history: List[Dict], metadata: Dict, timestamp: datetime) -> Tuple[str, bytes, Dict[str, str]]:
+        """
+        Format and serialize a conversation for upload.
+        
+        Roles are corrected while formatting, so the result is not
+        re-validated here.
+        
+        Args:
+            session_id: Unique session identifier
+            chat_history: List of conversation messages
+            metadata: Additional conversation metadata
+            timestamp: Conversation end time used for the S3 key
+            
+        Returns:
+            Tuple[str, bytes, Dict[str, str]]: S3 key, gzip-compressed JSON body and S3 object metadata
+        """
+        # Format conversation data with role validation and correction
+        conversation_data, statistics = self._format_conversation_data(session_id, chat_history, metadata)
+        
+        # Generate S3 key
+        s3_key = self._generate_s3_key(session_id, timestamp)
+        
+        # Convert to compact UTF-8 JSON - orjson emits bytes directly, so there is no str to encode.
+        # Transcripts are highly redundant text, so gzip shrinks them several times over.
+        body_bytes = gzip.compress(orjson.dumps(conversation_data), compresslevel=6)
+        
+        # Set S3 object metadata for searchability
+        s3_metadata = {
+            'session-id': session_id,
+            'message-count': str(statistics['total_messages']),
+            'user-messages': str(statistics['user_messages']),
+            'assistant-messages': str(statistics['assistant_messages']),
+            'duration-seconds': str(conversation_data['metadata']['duration_seconds']),
+            'compressed-size': str(len(body_bytes))
+        }
+        
+        return s3_key, body_bytes, s3_metadata
+    
+    def _put_one(self, s3_key: str, body_bytes: bytes, s3_metadata: Dict[str, str]) -> bool:
+        """
+        Upload a single serialized conversation to S3.
+        
+        Retries on throttling and transient errors are handled by the
+        client's adaptive retry mode. This call blocks and is meant to be
+        run in a worker thread.
+        
+        Args:
+            s3_key: Destination S3 key
+            body_bytes: Gzip-compressed conversation JSON
+            s3_metadata: S3 object metadata
+            
+        Returns:
+            bool: True if upload successful, False otherwise
+        """
+        try:
+            if len(body_bytes) < MULTIPART_THRESHOLD:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=body_bytes,
+                    ContentType='application/json',
+                    ContentEncoding='gzip',
+                    Metadata=s3_metadata
+                )
+            else:
+                # Large conversations are uploaded in parallel parts
+                self.s3_client.upload_fileobj(
+                    io.BytesIO(body_bytes),
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs={'ContentType': 'application/json', 'ContentEncoding': 'gzip', 'Metadata': s3_metadata},
+                    Config=self.transfer_config
+                )
+            
+            logger.info(f"Successfully uploaded conversation to S3: {s3_key}")
+            return True
+            
+        except ClientError as e:
+            logger.error(f"S3 upload failed: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error during S3 upload: {e}")
+            return False
+    
     async def upload_conversation(self, session_id: str, chat_history: List[Dict], metadata: Dict) -> bool:
         """
-        Upload conversation to S3 with error handling and retry logic.
+        Upload conversation to S3 with error handling.
         
         Args:
             session_id: Unique session identifier
@@ -387,65 +560,64 @@ class S3StorageService:
             return False
         
         try:
-            # Format conversation data with role validation and correction
-            conversation_data = self._format_conversation_data(session_id, chat_history, metadata)
-            
-            # Validate conversation data integrity
-            validation_results = self.validate_conversation_data(conversation_data)
-            if not validation_results['is_valid']:
-                logger.warning(f"Conversation validation issues found: {validation_results['issues']}")
-                # Continue with upload but log the issues
-            else:
-                logger.debug("Conversation data validation passed")
-            
-            # Generate S3 key
-            timestamp = datetime.fromisoformat(metadata.get('end_time', datetime.utcnow().isoformat()).replace('Z', '+00:00'))
-            s3_key = self._generate_s3_key(session_id, timestamp)
-            
-            # Convert to JSON
-            json_data = json.dumps(conversation_data, indent=2, ensure_ascii=False)
-            
-            # Set S3 object metadata for searchability
-            s3_metadata = {
-                'session-id': session_id,
-                'message-count': str(conversation_data['metadata']['message_count']),
-                'user-messages': str(conversation_data['metadata']['user_messages']),
-                'assistant-messages': str(conversation_data['metadata']['assistant_messages']),
-                'duration-seconds': str(conversation_data['metadata']['duration_seconds'])
-            }
-            
-            # Upload to S3 with retry logic
-            max_retries = 2
-            for attempt in range(max_retries):
-                try:
-                    self.s3_client.put_object(
-                        Bucket=self.bucket_name,
-                        Key=s3_key,
-                        Body=json_data.encode('utf-8'),
-                        ContentType='application/json',
-                        Metadata=s3_metadata
-                    )
-                    
-                    logger.info(f"Successfully uploaded conversation to S3: {s3_key}")
-                    return True
-                    
-                except ClientError as e:
-                    error_code = e.response['Error']['Code']
-                    if attempt < max_retries - 1 and error_code in ['ServiceUnavailable', 'SlowDown']:
-                        logger.warning(f"S3 upload attempt {attempt + 1} failed with {error_code}, retrying...")
-                        continue
-                    else:
-                        logger.error(f"S3 upload failed after {attempt + 1} attempts: {e}")
-                        return False
-                        
-        except json.JSONEncodeError as e:
+            timestamp = self._parse_end_time(metadata)
+        except ValueError as e:
+            logger.error(f"Invalid conversation end_time {metadata.get('end_time')!r}: {e}")
+            return False
+        
+        try:
+            s3_key, body_bytes, s3_metadata = self._prepare_upload(session_id, chat_history, metadata, timestamp)
+        except orjson.JSONEncodeError as e:
+            # Raised only by orjson.dumps; formatting errors fall through to the generic handler
             logger.error(f"Failed to serialize conversation data to JSON: {e}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error during S3 upload: {e}")
             return False
         
-        return False
+        # Run the blocking upload in a worker thread so the event loop stays responsive
+        return await asyncio.to_thread(self._put_one, s3_key, body_bytes, s3_metadata)
+    
+    async def upload_conversations_batch(self, items: List[Tuple[str, List[Dict], Dict]]) -> List[bool]:
+        """
+        Upload several conversations to S3 concurrently.
+        
+        Args:
+            items: List of (session_id, chat_history, metadata) tuples
+            
+        Returns:
+            List[bool]: Upload result for each item, in input order
+        """
+        if not self.enabled:
+            logger.debug("S3 storage disabled, skipping batch upload")
+            return [False] * len(items)
+            
+        if not self.s3_client or not self.bucket_name:
+            logger.error("S3 client or bucket not configured")
+            return [False] * len(items)
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        
+        async def upload_one(session_id: str, chat_history: List[Dict], metadata: Dict) -> bool:
+            if not chat_history:
+                logger.debug(f"No conversation history to upload for session {session_id}")
+                return False
+            try:
+                timestamp = self._parse_end_time(metadata)
+            except ValueError as e:
+                logger.error(f"Invalid end_time {metadata.get('end_time')!r} for conversation {session_id}: {e}")
+                return False
+            try:
+                prepared = self._prepare_upload(session_id, chat_history, metadata, timestamp)
+            except Exception as e:
+                logger.error(f"Failed to prepare conversation {session_id} for upload: {e}")
+                return False
+            async with semaphore:
+                return await asyncio.to_thread(self._put_one, *prepared)
+        
+        results = await asyncio.gather(*(upload_one(*item) for item in items))
+        logger.info(f"Batch upload complete: {sum(results)}/{len(items)} conversations stored")
+        return list(results)
     
     def validate_startup_connectivity(self) -> bool:
         """
@@ -0,0 +1,53 @@
+"""
+Test history content id and timestamp helpers.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import re
+import time
+import history_utils
+from history_utils import new_cid, utc_timestamp
+
+
+def test_new_cid():
+    """Test that content ids are unique 32-character hex strings."""
+    cids = {new_cid() for _ in range(100)}
+    assert len(cids) == 100
+    assert all(re.fullmatch(r'[0-9a-f]{32}', cid) for cid in cids)
+    
+    print("Content id test passed!")
+
+
+def test_utc_timestamp_cached_within_millisecond():
+    """Test timestamp format and reuse within the same millisecond."""
+    timestamp = utc_timestamp()
+    assert re.fullmatch(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}Z', timestamp), timestamp
+    
+    # Pretend the cached value was generated just now
+    history_utils._last_ts_ns = time.time_ns()
+    history_utils._last_ts = 'cached'
+    assert utc_timestamp() == 'cached'
+    
+    print("Timestamp cache test passed!")
+
+
+def test_utc_timestamp_clock_step_backwards():
+    """Test that a cached timestamp from the future is not reused."""
+    # Simulate the wall clock having been stepped back by an hour
+    history_utils._last_ts_ns = time.time_ns() + 3600 * 1_000_000_000
+    history_utils._last_ts = '2999-01-01T00:00:00.000000Z'
+    
+    timestamp = utc_timestamp()
+    assert timestamp != '2999-01-01T00:00:00.000000Z'
+    assert history_utils._last_ts_ns <= time.time_ns()
+    
+    print("Timestamp clock step test passed!")
+
+
+if __name__ == "__main__":
+    test_new_cid()
+    test_utc_timestamp_cached_within_millisecond()
+    test_utc_timestamp_clock_step_backwards()
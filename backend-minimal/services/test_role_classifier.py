@@ -36,6 +36,10 @@ def test_role_classifier():
     assistant_event = {"event": {"textOutput": {"content": "Hi there"}}}
     assert classifier.classify_websocket_event(assistant_event) == "ASSISTANT"
     
+    # Events with several known keys follow rule order, so user events win
+    mixed_event = {"event": {"contentStart": {}, "toolUse": {"toolName": "room_service"}}}
+    assert classifier.classify_websocket_event(mixed_event) == "USER"
+    
     # Test default role for ambiguous cases
     assert classifier.classify_message_role() == "ASSISTANT"
     
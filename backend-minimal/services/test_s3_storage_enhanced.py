@@ -6,11 +6,45 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import s3_conversation_storage
 from s3_conversation_storage import S3StorageService
 from datetime import datetime
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+import unittest
 import uuid
 
 
+class StubS3Client:
+    """Stand-in for the boto3 S3 client that keeps put_object calls in memory."""
+
+    def __init__(self, fail_sessions=()):
+        self.objects = {}
+        self.calls = []
+        self.fail_sessions = fail_sessions
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        if any(session in Key for session in self.fail_sessions):
+            raise RuntimeError("simulated S3 failure")
+        self.objects[Key] = {'Body': Body, **kwargs}
+        self.calls.append('put_object')
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        self.objects[Key] = {'Body': Fileobj.read(), 'ExtraArgs': ExtraArgs, 'Config': Config}
+        self.calls.append('upload_fileobj')
+
+
+def make_upload_service(client):
+    """Create an S3 service that uploads to the given stub client."""
+    s3_service = S3StorageService(enabled=False)
+    s3_service.enabled = True
+    s3_service.s3_client = client
+    return s3_service
+
+
 def test_role_validation_and_correction():
     """Test role validation and correction in S3 storage service."""
     # Create S3 service (disabled for testing)
@@ -61,7 +95,7 @@ def test_role_validation_and_correction():
     }
     
     # Test role validation and correction
-    corrected_history = s3_service._validate_and_correct_roles(chat_history)
+    corrected_history, corrections_made = s3_service._validate_and_correct_roles(chat_history)
     
     print("Original vs Corrected Roles:")
     for i, (original, corrected) in enumerate(zip(chat_history, corrected_history)):
@@ -75,6 +109,7 @@ def test_role_validation_and_correction():
     assert corrected_history[2]['role'] == 'ASSISTANT'  # INVALID_ROLE corrected to ASSISTANT
     assert corrected_history[3]['role'] == 'USER'
     assert corrected_history[4]['role'] == 'ASSISTANT'
+    assert corrections_made == 1
     
     print("Role validation and correction test passed!")
 
@@ -120,7 +155,7 @@ def test_conversation_formatting():
     }
     
     # Format conversation data
-    formatted_data = s3_service._format_conversation_data('test-session', chat_history, metadata)
+    formatted_data, statistics = s3_service._format_conversation_data('test-session', chat_history, metadata)
     
     print(f"Formatted conversation metadata:")
     print(f"  Total messages: {formatted_data['metadata']['message_count']}")
@@ -133,6 +168,15 @@ def test_conversation_formatting():
     assert formatted_data['metadata']['user_messages'] == 2
     assert formatted_data['metadata']['assistant_messages'] == 2
     assert 'coffee_service' in formatted_data['metadata']['tools_used']
+    assert statistics['user_messages'] == 2
+    assert statistics['assistant_messages'] == 2
+    assert statistics['invalid_roles'] == 0
+    
+    # Unhashable roles are corrected rather than raising
+    odd_history = [{'role': ['USER'], 'text': 'List role'}, {'role': {'r': 'USER'}, 'text': 'Dict role'}]
+    odd_data, odd_statistics = s3_service._format_conversation_data('test-session', odd_history, metadata)
+    assert [msg['role'] for msg in odd_data['conversation']] == ['ASSISTANT', 'ASSISTANT']
+    assert odd_statistics['corrections_made'] == 2
     
     print("Conversation formatting test passed!")
 
@@ -214,10 +258,131 @@ def test_conversation_validation():
     assert invalid_results['is_valid'] == False
     assert len(invalid_results['issues']) > 0
     
+    # An unhashable role is reported per message instead of aborting validation
+    unhashable_conversation = {**valid_conversation, 'conversation': [{**valid_conversation['conversation'][0], 'role': ['USER']}, valid_conversation['conversation'][1]]}
+    unhashable_results = s3_service.validate_conversation_data(unhashable_conversation)
+    assert unhashable_results['is_valid'] == False
+    assert "Message 1 has invalid role: ['USER']" in unhashable_results['issues']
+    assert unhashable_results['statistics']['invalid_roles'] == 1
+    
     print("Conversation validation test passed!")
 
 
+def test_conversation_upload():
+    """Test S3 key layout and gzip body of an uploaded conversation."""
+    client = StubS3Client()
+    s3_service = make_upload_service(client)
+    
+    chat_history = [
+        {'role': 'USER', 'text': 'Hello', 'contentName': 'c1', 'timestamp': '2025-12-19T10:00:00Z'},
+        {'role': 'ASSISTANT', 'text': 'Hi there!', 'contentName': 'c2', 'timestamp': '2025-12-19T10:00:05Z'}
+    ]
+    metadata = {
+        'start_time': '2025-12-19T10:00:00Z',
+        'end_time': '2025-12-19T10:00:25Z',
+        'duration_seconds': 25
+    }
+    
+    assert asyncio.run(s3_service.upload_conversation('session-a', chat_history, metadata)) == True
+    
+    # Key is {prefix}/{2-hex shard}/YYYY/MM/DD/conversation_{YYYYMMDD}_{HHMMSS}_{session}.json.gz
+    [key] = client.objects
+    shard = hashlib.sha1(b'session-a').hexdigest()[:2]
+    pattern = re.escape(s3_service.s3_prefix) + r'/([0-9a-f]{2})/2025/12/19/conversation_20251219_100025_session-a\.json\.gz'
+    match = re.fullmatch(pattern, key)
+    assert match is not None, key
+    assert match.group(1) == shard
+    
+    # Body is gzip-compressed JSON of the formatted conversation
+    stored = client.objects[key]
+    assert stored['ContentEncoding'] == 'gzip'
+    body = json.loads(gzip.decompress(stored['Body']))
+    assert body['session_id'] == 'session-a'
+    assert body['metadata']['message_count'] == 2
+    assert body['metadata']['end_time'] == '2025-12-19T10:00:25Z'
+    assert [msg['text'] for msg in body['conversation']] == ['Hello', 'Hi there!']
+    assert stored['Metadata']['compressed-size'] == str(len(stored['Body']))
+    
+    # Empty history is not uploaded
+    assert asyncio.run(s3_service.upload_conversation('session-empty', [], metadata)) == False
+    assert len(client.objects) == 1
+    
+    # Unparseable end_time is rejected before anything is uploaded
+    bad_metadata = {**metadata, 'end_time': 'garbage'}
+    assert asyncio.run(s3_service.upload_conversation('session-bad', chat_history, bad_metadata)) == False
+    assert len(client.objects) == 1
+    
+    # Only JSON encoding failures are reported as serialization errors
+    logs = unittest.TestCase()
+    unserializable_metadata = {**metadata, 'duration_seconds': object()}
+    with logs.assertLogs('s3_conversation_storage', level='ERROR') as captured:
+        assert asyncio.run(s3_service.upload_conversation('session-bad', chat_history, unserializable_metadata)) == False
+    assert 'Failed to serialize conversation data to JSON' in captured.output[0]
+    
+    with logs.assertLogs('s3_conversation_storage', level='ERROR') as captured:
+        assert asyncio.run(s3_service.upload_conversation('session-bad', ['not a message'], metadata)) == False
+    assert 'Unexpected error during S3 upload' in captured.output[0]
+    assert len(client.objects) == 1
+    
+    print("Conversation upload test passed!")
+
+
+def test_conversation_multipart_upload():
+    """Test that large conversations go through upload_fileobj with the same headers."""
+    client = StubS3Client()
+    s3_service = make_upload_service(client)
+    
+    chat_history = [{'role': 'USER', 'text': 'Hello', 'contentName': 'c1', 'timestamp': '2025-12-19T10:00:00Z'}]
+    metadata = {'end_time': '2025-12-19T10:00:25Z', 'duration_seconds': 25}
+    
+    # Lower the threshold so even this small body takes the multipart path
+    original_threshold = s3_conversation_storage.MULTIPART_THRESHOLD
+    s3_conversation_storage.MULTIPART_THRESHOLD = 1
+    try:
+        assert asyncio.run(s3_service.upload_conversation('session-big', chat_history, metadata)) == True
+    finally:
+        s3_conversation_storage.MULTIPART_THRESHOLD = original_threshold
+    
+    assert client.calls == ['upload_fileobj']
+    [stored] = client.objects.values()
+    extra_args = stored['ExtraArgs']
+    assert extra_args['ContentType'] == 'application/json'
+    assert extra_args['ContentEncoding'] == 'gzip'
+    assert extra_args['Metadata']['session-id'] == 'session-big'
+    assert extra_args['Metadata']['compressed-size'] == str(len(stored['Body']))
+    assert stored['Config'] is s3_service.transfer_config
+    assert json.loads(gzip.decompress(stored['Body']))['session_id'] == 'session-big'
+    
+    print("Conversation multipart upload test passed!")
+
+
+def test_conversation_batch_upload():
+    """Test that batch upload results come back in input order."""
+    client = StubS3Client(fail_sessions=('session-fail',))
+    s3_service = make_upload_service(client)
+    
+    chat_history = [{'role': 'USER', 'text': 'Hello', 'contentName': 'c1', 'timestamp': '2025-12-19T10:00:00Z'}]
+    metadata = {'end_time': '2025-12-19T10:00:25Z', 'duration_seconds': 25}
+    
+    items = [
+        ('session-fail', chat_history, metadata),
+        ('session-a', chat_history, metadata),
+        ('session-empty', [], metadata),
+        ('session-b', chat_history, metadata)
+    ]
+    results = asyncio.run(s3_service.upload_conversations_batch(items))
+    
+    assert results == [False, True, False, True]
+    uploaded = sorted(json.loads(gzip.decompress(obj['Body']))['session_id'] for obj in client.objects.values())
+    assert uploaded == ['session-a', 'session-b']
+    
+    print("Conversation batch upload test passed!")
+
+
 if __name__ == "__main__":
     test_role_validation_and_correction()
     test_conversation_formatting()
-    test_conversation_validation()
\ No newline at end of file
+    test_conversation_validation()
+    test_conversation_upload()
+    test_conversation_multipart_upload()
+    test_conversation_batch_upload()
\ No newline at end of file
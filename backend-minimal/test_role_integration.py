@@ -6,28 +6,28 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'services'))
 
-from role_classifier import RoleClassifier
-from datetime import datetime
-import uuid
+from role_classifier import RoleClassifier, VALID_ROLES
+from history_utils import new_cid, utc_timestamp
+from collections import deque
 
 
 class MockConnectionManager:
     """Mock ConnectionManager to test role classification integration."""
     
     def __init__(self):
-        self.chat_history = []
         self.max_history = 10
+        self.chat_history = deque(maxlen=self.max_history)
         self.role_classifier = RoleClassifier()
     
     def add_history(self, role, text, source_info=None):
         """Add a message to the rolling chat history with role validation."""
         # Validate and correct role if needed
-        if not self.role_classifier.validate_role(role):
+        if role not in VALID_ROLES:
             print(f"Invalid role '{role}' provided to add_history. Correcting to valid role.")
             role = self.role_classifier.correct_invalid_role(role)
         
-        content_name = str(uuid.uuid4())
-        timestamp = datetime.utcnow().isoformat() + 'Z'
+        content_name = new_cid()
+        timestamp = utc_timestamp()
         
         message = {
             'role': role,
@@ -41,15 +41,13 @@ class MockConnectionManager:
             message['source_info'] = source_info
         
         self.chat_history.append(message)
-        
-        # Keep only the last N messages
-        if len(self.chat_history) > self.max_history:
-            self.chat_history = self.chat_history[-self.max_history:]
     
     def add_message_from_event(self, event_data, text, event_type=None, source="websocket"):
         """Add a message to history with automatic role classification based on event data."""
-        # Classify the role based on event data
-        if event_type:
+        # Classify the role based on event data; known event types map straight to a role
+        if event_type in self.role_classifier.EVENT_ROLES:
+            role = self.role_classifier.EVENT_ROLES[event_type]
+        elif event_type:
             role = self.role_classifier.classify_message_role(
                 source=source,
                 event_type=event_type,
@@ -69,8 +67,8 @@ class MockConnectionManager:
         self.add_history(role, text, source_info)
     
     def get_history(self):
-        """Get the current rolling chat history."""
-        return self.chat_history.copy()
+        """Get the current rolling chat history (live, read-only)."""
+        return self.chat_history
 
 
 def test_role_integration():
@@ -6,9 +6,9 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'services'))
 
-from role_classifier import RoleClassifier
-from datetime import datetime
-import uuid
+from role_classifier import RoleClassifier, VALID_ROLES
+from history_utils import new_cid, utc_timestamp
+from collections import Counter, deque
 import json
 
 
@@ -16,20 +16,20 @@ class MockConnectionManager:
     """Mock ConnectionManager to test WebSocket handler enhancements."""
     
     def __init__(self):
-        self.chat_history = []
         self.max_history = 10
+        self.chat_history = deque(maxlen=self.max_history)
         self.role_classifier = RoleClassifier()
         self.nova_client = None
         self.active_connection = None
     
     def add_history(self, role, text, source_info=None):
         """Add a message to the rolling chat history with role validation."""
-        if not self.role_classifier.validate_role(role):
+        if role not in VALID_ROLES:
             print(f"Invalid role '{role}' provided to add_history. Correcting to valid role.")
             role = self.role_classifier.correct_invalid_role(role)
         
-        content_name = str(uuid.uuid4())
-        timestamp = datetime.utcnow().isoformat() + 'Z'
+        content_name = new_cid()
+        timestamp = utc_timestamp()
         
         message = {
             'role': role,
@@ -42,13 +42,13 @@ class MockConnectionManager:
             message['source_info'] = source_info
         
         self.chat_history.append(message)
-        
-        if len(self.chat_history) > self.max_history:
-            self.chat_history = self.chat_history[-self.max_history:]
     
     def add_message_from_event(self, event_data, text, event_type=None, source="websocket"):
         """Add a message to history with automatic role classification based on event data."""
-        if event_type:
+        # Known event types map straight to a role
+        if event_type in self.role_classifier.EVENT_ROLES:
+            role = self.role_classifier.EVENT_ROLES[event_type]
+        elif event_type:
             role = self.role_classifier.classify_message_role(
                 source=source,
                 event_type=event_type,
@@ -66,8 +66,8 @@ class MockConnectionManager:
         self.add_history(role, text, source_info)
     
     def get_history(self):
-        """Get the current rolling chat history."""
-        return self.chat_history.copy()
+        """Get the current rolling chat history (live, read-only)."""
+        return self.chat_history
 
 
 def test_websocket_event_processing():
@@ -180,9 +180,10 @@ def test_conversation_statistics():
     
     history = manager.get_history()
     
-    # Count messages by role
-    user_count = sum(1 for msg in history if msg['role'] == 'USER')
-    assistant_count = sum(1 for msg in history if msg['role'] == 'ASSISTANT')
+    # Count messages by role in a single pass
+    role_counts = Counter(msg['role'] for msg in history)
+    user_count = role_counts['USER']
+    assistant_count = role_counts['ASSISTANT']
     
     print(f"User messages: {user_count}, Assistant messages: {assistant_count}")
     
@@ -1,25 +1,45 @@
-from typing import Dict, Any, Optional
+import json
+from typing import Dict, Any, Optional, Union, Awaitable
 from abc import ABC, abstractmethod
 
 class BaseTool(ABC):
+    # Tools are long-lived singletons; slots avoid a per-instance __dict__
+    __slots__ = ("name",)
+
+    # True when execute() is a plain method returning the result dict
+    # rather than a coroutine; ToolManager then calls it without awaiting
+    is_sync: bool = False
+
+    # Configs are static, so subclasses declare them once at class level
+    config: Dict[str, Any] = {
+        "name": "",
+        "description": "",
+        "shortDescription": "",
+        "schema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Serialize each subclass's schema once per process for ToolManager
+        config = cls.__dict__.get("config")
+        if config is not None:
+            config["_schema_json"] = json.dumps(config["schema"], separators=(",", ":"))
+
     def __init__(self):
         self.name: str = self.__class__.__name__
-        self.config: Dict[str, Any] = {
-            "name": "",
-            "description": "",
-            "shortDescription": "",
-            "schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        }
 
     @abstractmethod
-    async def execute(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(self, content: Dict[str, Any]) -> Union[Dict[str, Any], Awaitable[Dict[str, Any]]]:
         """
         Execute the tool with the given content.
         Must return a dict with 'model_result' and 'ui_result' keys.
+        Tools with is_sync = True implement this as a plain method
+        returning the dict; all others implement it as an async method,
+        whose coroutine the caller awaits.
         """
         pass
 
@@ -2,20 +2,22 @@ from typing import Dict, Any
 from ...base.tool import BaseTool
 
 class SampleImageTool(BaseTool):
-    def __init__(self):
-        super().__init__()
-        self.config = {
-            "name": "showSampleImageTool",
-            "description": "Display a sample image in the tool output panel",
-            "shortDescription": "Showing a sample image",
-            "schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+    __slots__ = ()
+
+    is_sync = True
+
+    config = {
+        "name": "showSampleImageTool",
+        "description": "Display a sample image in the tool output panel",
+        "shortDescription": "Showing a sample image",
+        "schema": {
+            "type": "object",
+            "properties": {},
+            "required": []
         }
+    }
 
-    async def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
         # Model result - detailed data for the model to use
         model_result = {
             "type": "image",
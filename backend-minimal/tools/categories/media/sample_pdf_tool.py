@@ -2,20 +2,22 @@ from typing import Dict, Any
 from ...base.tool import BaseTool
 
 class SamplePdfTool(BaseTool):
-    def __init__(self):
-        super().__init__()
-        self.config = {
-            "name": "showSamplePdfTool",
-            "description": "Display a sample PDF document in the tool output panel",
-            "shortDescription": "Showing a sample PDF",
-            "schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+    __slots__ = ()
+
+    is_sync = True
+
+    config = {
+        "name": "showSamplePdfTool",
+        "description": "Display a sample PDF document in the tool output panel",
+        "shortDescription": "Showing a sample PDF",
+        "schema": {
+            "type": "object",
+            "properties": {},
+            "required": []
         }
+    }
 
-    async def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
         # Using a reliable sample PDF URL
         pdf_url = "https://www.adobe.com/support/products/enterprise/knowledgecenter/media/c4611_sample_explain.pdf"
         
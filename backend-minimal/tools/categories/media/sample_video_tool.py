@@ -1,39 +1,50 @@
+import re
 from typing import Dict, Any
 from ...base.tool import BaseTool
 
+# Embed URL templates, with and without player controls
+_EMBED_TMPL = "https://www.youtube-nocookie.com/embed/{}?rel=0&modestbranding=1"
+_EMBED_TMPL_NOCTL = _EMBED_TMPL + "&controls=0"
+
+# Same rule as the schema "pattern"; malformed IDs fall back to the default video
+_VIDEO_ID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+_DEFAULT_VIDEO_ID = "a9__D53WsUs"
+
 class SampleVideoTool(BaseTool):
-    def __init__(self):
-        super().__init__()
-        self.config = {
-            "name": "showSampleVideoTool",
-            "description": "Display a YouTube video in the tool output panel. Use this tool when you need to show a video demonstration, tutorial, or any YouTube content. The tool will embed the video directly in the conversation.",
-            "shortDescription": "Show a YouTube video",
-            "schema": {
-                "type": "object",
-                "properties": {
-                    "videoId": {
-                        "type": "string",
-                        "description": "Optional: YouTube video ID to display. If not provided, will show a default video.",
-                        "pattern": "^[A-Za-z0-9_-]{11}$"
-                    },
-                    "showControls": {
-                        "type": "boolean",
-                        "description": "Optional: Whether to show video controls. Defaults to true."
-                    }
+    __slots__ = ()
+
+    is_sync = True
+
+    config = {
+        "name": "showSampleVideoTool",
+        "description": "Display a YouTube video in the tool output panel. Use this tool when you need to show a video demonstration, tutorial, or any YouTube content. The tool will embed the video directly in the conversation.",
+        "shortDescription": "Show a YouTube video",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "videoId": {
+                    "type": "string",
+                    "description": "Optional: YouTube video ID to display. If not provided, will show a default video.",
+                    "pattern": "^[A-Za-z0-9_-]{11}$"
+                },
+                "showControls": {
+                    "type": "boolean",
+                    "description": "Optional: Whether to show video controls. Defaults to true."
                 }
             }
         }
+    }
 
-    async def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
         try:
             # Get video ID from content or use default
-            video_id = content.get("videoId", "a9__D53WsUs")
+            video_id = content.get("videoId", _DEFAULT_VIDEO_ID)
+            if not isinstance(video_id, str) or not _VIDEO_ID_RE.fullmatch(video_id):
+                video_id = _DEFAULT_VIDEO_ID
             show_controls = content.get("showControls", True)
             
             # Build embed URL with appropriate parameters
-            embed_url = f"https://www.youtube-nocookie.com/embed/{video_id}?rel=0&modestbranding=1"
-            if not show_controls:
-                embed_url += "&controls=0"
+            embed_url = (_EMBED_TMPL if show_controls else _EMBED_TMPL_NOCTL).format(video_id)
             
             # Model result - detailed data for the model to use
             model_result = {
@@ -1,64 +1,78 @@
-import datetime
+from datetime import date, timedelta
+import functools
 import hashlib
+import itertools
 import random
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from ...base.tool import BaseTool
 
+# Possible statuses with weights
+_STATUSES = (
+    "Order received",
+    "Processing",
+    "Preparing for shipment",
+    "Shipped",
+    "In transit",
+    "Out for delivery",
+    "Delivered",
+    "Delayed"
+)
+# Cumulative weights let random.choices skip its per-call accumulation
+_CUM_WEIGHTS = tuple(itertools.accumulate((10, 15, 15, 20, 20, 10, 5, 3)))
+
+# Extra model field (and card footer text) for statuses that carry one
+_STATUS_EXTRA = {
+    "In transit": ("currentLocation", "Distribution Center"),
+    "Delivered": ("deliveryLocation", "Front Door"),
+    "Delayed": ("additionalInfo", "Weather delays possible")
+}
+
+@functools.lru_cache(maxsize=1024)
+def _status_for(order_id: str) -> Tuple[str, int]:
+    """Deterministic (status, delivery day offset) for an order ID; cached for repeat queries"""
+    # Private generator, so concurrent calls never touch the global random state
+    rng = random.Random(int.from_bytes(hashlib.blake2b(order_id.encode(), digest_size=4).digest(), "little"))
+    status = rng.choices(_STATUSES, cum_weights=_CUM_WEIGHTS, k=1)[0]
+    if status == "Delivered":
+        return status, -rng.randint(0, 3)
+    if status == "Out for delivery":
+        return status, 0
+    return status, rng.randint(1, 10)
+
 class TrackOrderTool(BaseTool):
-    def __init__(self):
-        super().__init__()
-        self.config = {
-            "name": "trackOrderTool",
-            "description": "Track the status of an order by order ID",
-            "shortDescription": "Tracking an order",
-            "schema": {
-                "type": "object",
-                "properties": {
-                    "orderId": {
-                        "type": "string",
-                        "description": "The order ID to track"
-                    },
-                    "requestNotifications": {
-                        "type": "boolean",
-                        "description": "Whether to request notifications for this order"
-                    }
+    __slots__ = ()
+
+    is_sync = True
+
+    config = {
+        "name": "trackOrderTool",
+        "description": "Track the status of an order by order ID",
+        "shortDescription": "Tracking an order",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "orderId": {
+                    "type": "string",
+                    "description": "The order ID to track"
                 },
-                "required": ["orderId"]
-            }
+                "requestNotifications": {
+                    "type": "boolean",
+                    "description": "Whether to request notifications for this order"
+                }
+            },
+            "required": ["orderId"]
         }
+    }
 
-    async def execute(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(self, content: Dict[str, Any]) -> Dict[str, Any]:
         order_id = content.get("orderId", "")
         request_notifications = content.get("requestNotifications", False)
         
-        # Create deterministic randomness based on order ID
-        seed = int(hashlib.md5(str(order_id).encode(), usedforsecurity=False).hexdigest(), 16) % 10000
-        random.seed(seed)
-        
-        # Possible statuses with weights
-        statuses = [
-            "Order received", 
-            "Processing", 
-            "Preparing for shipment",
-            "Shipped",
-            "In transit", 
-            "Out for delivery",
-            "Delivered",
-            "Delayed"
-        ]
-        weights = [10, 15, 15, 20, 20, 10, 5, 3]
-        status = random.choices(statuses, weights=weights, k=1)[0]
+        # Create deterministic status based on order ID
+        status, delivery_days = _status_for(str(order_id))
         
         # Generate delivery date based on status
-        today = datetime.datetime.now()
-        if status == "Delivered":
-            delivery_days = -random.randint(0, 3)
-        elif status == "Out for delivery":
-            delivery_days = 0
-        else:
-            delivery_days = random.randint(1, 10)
-            
-        estimated_delivery = (today + datetime.timedelta(days=delivery_days)).strftime("%Y-%m-%d")
+        estimated_delivery = (date.today() + timedelta(days=delivery_days)).isoformat()
         
         # Model result - detailed data for the model to use
         model_result = {
@@ -68,12 +82,11 @@ class TrackOrderTool(BaseTool):
             "notificationStatus": f"You will receive notifications for order {order_id}" if request_notifications else ""
         }
 
-        if status == "In transit":
-            model_result["currentLocation"] = "Distribution Center"
-        elif status == "Delivered":
-            model_result["deliveryLocation"] = "Front Door"
-        elif status == "Delayed":
-            model_result["additionalInfo"] = "Weather delays possible"
+        footer_text = ""
+        extra = _STATUS_EXTRA.get(status)
+        if extra:
+            key, footer_text = extra
+            model_result[key] = footer_text
 
         # UI result - formatted as a card for better presentation
         ui_result = {
@@ -86,9 +99,7 @@ class TrackOrderTool(BaseTool):
                     "Current Status": status
                 },
                 "footer": {
-                    "text": model_result.get("additionalInfo", "") or 
-                           model_result.get("currentLocation", "") or 
-                           model_result.get("deliveryLocation", ""),
+                    "text": footer_text,
                     "action": {
                         "text": "Track Another Order",
                         "url": "#"
@@ -1,38 +1,54 @@
-import datetime
-import pytz
+from datetime import datetime
+from zoneinfo import ZoneInfo
 from typing import Dict, Any
 from ...base.tool import BaseTool
 import time
 
+# Resolve the zone once per process rather than on every call
+_PST = ZoneInfo("America/Los_Angeles")
+
+# Static part of the UI card; execute() only fills in details and footer
+_UI_CONTENT_STATIC = {
+    "title": "Current Date & Time",
+    "description": "Current time in Pacific Time Zone",
+    "image": "https://images.unsplash.com/photo-1501139083538-0139583c060f?q=80&w=2940&auto=format&fit=crop",
+    "imageAlt": "Sundial representing time"
+}
+
 class DateAndTimeTool(BaseTool):
-    def __init__(self):
-        super().__init__()
-        self.config = {
-            "name": "getDateAndTimeTool",
-            "description": "Get information about the current date and time",
-            "shortDescription": "Getting date and time information",
-            "schema": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+    __slots__ = ()
+
+    is_sync = True
+
+    config = {
+        "name": "getDateAndTimeTool",
+        "description": "Get information about the current date and time",
+        "shortDescription": "Getting date and time information",
+        "schema": {
+            "type": "object",
+            "properties": {},
+            "required": []
         }
+    }
 
-    async def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute(self, content: Dict[str, Any] = None) -> Dict[str, Any]:
         # Get current date in PST timezone
-        pst_timezone = pytz.timezone("America/Los_Angeles")
-        pst_date = datetime.datetime.now(pst_timezone)
+        pst_date = datetime.now(_PST)
+        # Format every field in one strftime call and split it apart
+        time_str, date_str, day_name, month_name, full_time, long_date = pst_date.strftime(
+            "%I:%M %p|%Y-%m-%d|%A|%B|%I:%M:%S %p|%A, %B %d, %Y"
+        ).split("|")
 
         # time.sleep(10)
         
         # Model result - detailed data for the model to use
         model_result = {
-            "formattedTime": pst_date.strftime("%I:%M %p"),
-            "date": pst_date.strftime("%Y-%m-%d"),
+            "formattedTime": time_str,
+            "date": date_str,
             "year": pst_date.year,
             "month": pst_date.month,
             "day": pst_date.day,
-            "dayOfWeek": pst_date.strftime("%A").upper(),
+            "dayOfWeek": day_name.upper(),
             "timezone": "PST"
         }
         
@@ -40,20 +56,17 @@ class DateAndTimeTool(BaseTool):
         ui_result = {
             "type": "card",
             "content": {
-                "title": "Current Date & Time",
-                "description": "Current time in Pacific Time Zone",
+                **_UI_CONTENT_STATIC,
                 "details": {
-                    "Date": pst_date.strftime("%A, %B %d, %Y"),
-                    "Time": pst_date.strftime("%I:%M %p"),
+                    "Date": long_date,
+                    "Time": time_str,
                     "Time Zone": "Pacific Time (PST/PDT)",
-                    "Day of Week": pst_date.strftime("%A"),
-                    "Month": pst_date.strftime("%B"),
+                    "Day of Week": day_name,
+                    "Month": month_name,
                     "Year": str(pst_date.year)
                 },
-                "image": "https://images.unsplash.com/photo-1501139083538-0139583c060f?q=80&w=2940&auto=format&fit=crop",
-                "imageAlt": "Sundial representing time",
                 "footer": {
-                    "text": f"Last updated: {pst_date.strftime('%I:%M:%S %p')}",
+                    "text": f"Last updated: {full_time}",
                     "action": {
                         "text": "Refresh",
                         "url": "#"
@@ -1,6 +1,5 @@
 import os
-import json
-from typing import Dict, Any, List
+from typing import Dict, Any, Tuple, Callable
 from .base import ToolRegistry
 from .categories.utility import DateAndTimeTool
 from .categories.media import SampleImageTool, SamplePdfTool, SampleVideoTool
@@ -10,6 +9,14 @@ class ToolManager:
     def __init__(self):
         self.registry = ToolRegistry()
         self._initialize_registry()
+        # (bound execute method, sync flag) keyed by the registry's interned tool
+        # names, so dispatch is a single dict lookup with no attribute access
+        self._exec_by_name: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], bool]] = {
+            name: (tool.execute, tool.is_sync)
+            for name, tool in self.registry.get_tools().items()
+        }
+        # Tool specs are static after registration, so build them once
+        self._cached_tool_specs: Tuple[Dict[str, Any], ...] = self._build_tool_specs()
 
     def _initialize_registry(self) -> None:
         """Initialize the tool registry with all available tools"""
@@ -28,26 +35,33 @@ class ToolManager:
         ])
 
     async def execute_tool(self, tool_name: str, content: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a tool by name"""
-        try:
-            # All tools are now in the registry
-            return await self.registry.execute_tool(tool_name, content)
-        except KeyError:
+        """Execute a tool by name, awaiting it unless the tool is synchronous (is_sync)"""
+        entry = self._exec_by_name.get(tool_name)
+        if entry is None:
             raise KeyError(f"Tool '{tool_name}' not found")
 
-    def get_tool_configs(self) -> List[Dict[str, Any]]:
-        """Get all tool configurations formatted for Nova Sonic"""
-        configs = self.registry.get_tool_configs()
-        # Format each tool config according to Nova Sonic's expected format
-        return [
+        execute, sync = entry
+        # Synchronous tools hand back their result without a coroutine
+        if sync:
+            return execute(content)
+        return await execute(content)
+
+    def _build_tool_specs(self) -> Tuple[Dict[str, Any], ...]:
+        """Format every registered tool config according to Nova Sonic's expected format"""
+        # A tuple rather than MappingProxyType wrappers: callers json.dumps the specs
+        return tuple(
             {
                 "toolSpec": {
                     "name": config["name"],
                     "description": config["description"],
                     "inputSchema": {
-                        "json": json.dumps(config["schema"])
+                        "json": config["_schema_json"]
                     }
                 }
             }
-            for config in configs
-        ] 
\ No newline at end of file
+            for config in self.registry.get_tool_configs()
+        )
+
+    def get_tool_configs(self) -> Tuple[Dict[str, Any], ...]:
+        """Get all tool configurations formatted for Nova Sonic (shared, do not mutate)"""
+        return self._cached_tool_specs 
\ No newline at end of file